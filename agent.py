@@ -2,22 +2,19 @@
 Main Legislative Agent Module for processing legislation PDFs using Google Gemini API.
 """
 
-import sys
 import os
+import asyncio
 import logging
 import json
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-import google.generativeai as genai
-from src.text_utils import extract_text_from_pdf, clean_text, chunk_text
+from src.text_utils import extract_text_from_pdf, extract_text_from_pdf_bytes, clean_text, chunk_text
 from src.summarizer import Summarizer
 from src.section_extractor import SectionExtractor
 from src.rule_checker import RuleChecker
+from src.combined_extractor import CombinedExtractor
 from src.json_exporter import JSONExporter
-from typing import List, Dict, Any
+from src import gemini_client
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class LegislativeAgent:
@@ -29,6 +26,7 @@ class LegislativeAgent:
         self.summarizer = Summarizer(api_key)
         self.section_extractor = SectionExtractor(api_key)
         self.rule_checker = RuleChecker(api_key)
+        self.combined_extractor = CombinedExtractor(api_key)
         self.json_exporter = JSONExporter()
         logger.info("LegislativeAgent initialized")
     
@@ -37,25 +35,30 @@ class LegislativeAgent:
         logger.info("Starting text extraction from PDF: %s", pdf_path)
         return extract_text_from_pdf(pdf_path)
     
+    def extract_text_from_bytes(self, pdf_bytes: bytes) -> str:
+        """Extract text from PDF contents held in memory."""
+        logger.info("Starting text extraction from %d bytes of PDF data", len(pdf_bytes))
+        return extract_text_from_pdf_bytes(pdf_bytes)
+    
     def clean_text(self, raw_text: str) -> str:
         """Clean extracted text by removing artifacts and normalizing."""
         logger.info("Starting text cleaning")
         return clean_text(raw_text)
     
-    def chunk_text(self, text: str, chunk_size: int = 6000) -> List[str]:
-        """Split text into chunks of specified size."""
+    def chunk_text(self, text: str, chunk_size: int = 6000, chunk_overlap: int = 200) -> Iterator[str]:
+        """Lazily split text into overlapping chunks of specified size."""
         logger.info("Starting text chunking with chunk size: %d", chunk_size)
-        return chunk_text(text, chunk_size)
+        return chunk_text(text, chunk_size, chunk_overlap)
     
-    def summarize_chunks(self, chunks: List[str]) -> List[str]:
+    def summarize_chunks(self, chunks: Iterable[str]) -> List[str]:
         """Generate summaries for all chunks."""
         logger.info("Starting chunk summarization")
-        return self.summarizer.summarize_chunks(chunks)
+        return gemini_client.run(self.summarizer.summarize_chunks_async(chunks))
     
     def combine_summaries(self, chunk_summaries: List[str]) -> str:
         """Combine all chunk summaries into a final comprehensive summary."""
         logger.info("Starting summary combination")
-        return self.summarizer.combine_summaries(chunk_summaries)
+        return self.summarizer.tree_combine(chunk_summaries)
     
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Extract specific sections from the legislation text."""
@@ -67,6 +70,11 @@ class LegislativeAgent:
         logger.info("Starting legal document rule checks")
         return self.rule_checker.apply_rule_checks(text)
     
+    def extract_all(self, text: str) -> Dict[str, Any]:
+        """Extract sections and apply rule checks in a single LLM call."""
+        logger.info("Starting combined section extraction and rule checks")
+        return self.combined_extractor.extract_all(text)
+    
     def export_json(self, summary: str, sections: Dict[str, str], 
                    rule_checks: List[Dict[str, Any]], path: str) -> None:
         """Export the results to a JSON file."""
@@ -83,7 +91,7 @@ class LegislativeAgent:
         if os.path.exists(path):
             logger.info("Loading existing chunk summaries from: %s", path)
             try:
-                with open(path, 'r') as f:
+                with open(path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     if "chunk_summaries" in data:
                         logger.info("Successfully loaded %d chunk summaries", len(data["chunk_summaries"]))
@@ -92,31 +100,15 @@ class LegislativeAgent:
                 logger.warning("Failed to load existing chunk summaries: %s", str(e))
         return None
     
-    def process_legislation(self, pdf_path: str, output_path: str = "output/legislation_analysis.json") -> Dict[str, Any]:
-        """Complete processing pipeline for legislation PDF."""
-        logger.info("Starting legislation processing pipeline")
-        logger.info("PDF Path: %s", pdf_path)
-        logger.info("Output Path: %s", output_path)
-        
-        # Step 1: Extract text
-        logger.info("Step 1: Extracting text from PDF...")
-        raw_text = self.extract_text(pdf_path)
-        
-        # Step 2: Clean text
-        logger.info("Step 2: Cleaning text...")
-        cleaned_text = self.clean_text(raw_text)
-        
-        # Step 3: Chunk text
-        logger.info("Step 3: Chunking text...")
-        chunks = self.chunk_text(cleaned_text)
-        
+    async def _summarize_async(self, chunks: Iterable[str]) -> Tuple[List[str], str]:
+        """Summarize chunks (reusing stored summaries if available) and combine them."""
         # Step 4: Summarize chunks
         logger.info("Step 4: Summarizing chunks...")
         # Check if chunk summaries already exist
         chunk_summaries = self.load_existing_chunk_summaries()
         if chunk_summaries is None:
             logger.info("No existing chunk summaries found, generating new ones...")
-            chunk_summaries = self.summarize_chunks(chunks)
+            chunk_summaries = await self.summarizer.summarize_chunks_async(chunks)
             # Export chunk summaries for future use
             self.export_chunk_summaries(chunk_summaries, "output/chunk_summaries.json")
         else:
@@ -124,15 +116,51 @@ class LegislativeAgent:
         
         # Step 5: Combine summaries
         logger.info("Step 5: Combining summaries...")
-        final_summary = self.combine_summaries(chunk_summaries)
+        final_summary = await self.summarizer.tree_combine_async(chunk_summaries)
+        return chunk_summaries, final_summary
+    
+    async def _analyze_async(self, cleaned_text: str, chunks: Iterable[str]) -> Tuple[List[str], str, Dict[str, str], List[Dict[str, Any]]]:
+        """Run summarization concurrently with combined section extraction and rule checks."""
+        (chunk_summaries, final_summary), extracted = await asyncio.gather(
+            self._summarize_async(chunks),
+            self.combined_extractor.extract_all_async(cleaned_text)
+        )
+        return chunk_summaries, final_summary, extracted["sections"], extracted["rule_checks"]
+    
+    def process_legislation(self, pdf_path: Optional[str] = None, *, cleaned_text: Optional[str] = None,
+                            output_path: str = "output/legislation_analysis.json") -> Dict[str, Any]:
+        """Complete processing pipeline for legislation PDF.
+        
+        If cleaned_text is given (e.g. from an earlier extract/clean step), PDF
+        extraction and cleaning are skipped and pdf_path may be omitted.
+        """
+        if pdf_path is None and cleaned_text is None:
+            raise ValueError("Either pdf_path or cleaned_text must be provided")
+        logger.info("Starting legislation processing pipeline")
+        logger.info("PDF Path: %s", pdf_path)
+        logger.info("Output Path: %s", output_path)
+        
+        if cleaned_text is None:
+            # Step 1: Extract text
+            logger.info("Step 1: Extracting text from PDF...")
+            raw_text = self.extract_text(pdf_path)
+            
+            # Step 2: Clean text
+            logger.info("Step 2: Cleaning text...")
+            cleaned_text = self.clean_text(raw_text)
+        else:
+            logger.info("Steps 1-2: Using provided cleaned text")
         
-        # Step 6: Extract sections
-        logger.info("Step 6: Extracting sections...")
-        sections = self.extract_sections(cleaned_text)
+        # Step 3: Chunk text
+        logger.info("Step 3: Chunking text...")
+        chunks = self.chunk_text(cleaned_text)
         
-        # Step 7: Apply rule checks
-        logger.info("Step 7: Applying legal document rule checks...")
-        rule_checks = self.apply_rule_checks(cleaned_text)
+        # Steps 4-7: Summaries and the combined section extraction / rule checks call
+        # are independent LLM calls on the cleaned text, so run them concurrently
+        logger.info("Steps 4-7: Summarizing, extracting sections and applying rule checks concurrently...")
+        chunk_summaries, final_summary, sections, rule_checks = gemini_client.run(
+            self._analyze_async(cleaned_text, chunks)
+        )
         
         # Step 8: Export results
         logger.info("Step 8: Exporting results...")
@@ -2,19 +2,16 @@
 Streamlit UI for the Legislative AI Agent.
 """
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
 import streamlit as st
 import os
 import json
+import hashlib
 import logging
 from dotenv import load_dotenv
 from agent import LegislativeAgent
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -27,6 +24,28 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_agent(api_key: str) -> LegislativeAgent:
+    """Create one LegislativeAgent per API key and reuse it across reruns."""
+    return LegislativeAgent(api_key)
+
+@st.cache_data(show_spinner=False)
+def cached_extract(_agent: LegislativeAgent, pdf_bytes: bytes) -> str:
+    """Extract and clean text from the uploaded PDF, cached by the PDF contents."""
+    # Read the bytes themselves rather than a shared temp file another session may overwrite
+    raw_text = _agent.extract_text_from_bytes(pdf_bytes)
+    return _agent.clean_text(raw_text)
+
+@st.cache_data(show_spinner=False)
+def cached_process(_agent: LegislativeAgent, pdf_bytes: bytes, api_key_hash: str) -> dict:
+    """Run the full pipeline, cached by the PDF contents and API key hash."""
+    # Derive the text from pdf_bytes so it always matches the cache key
+    cleaned_text = cached_extract(_agent, pdf_bytes)
+    return _agent.process_legislation(
+        cleaned_text=cleaned_text,
+        output_path="legislation_analysis.json"
+    )
+
 # Initialize session state
 if 'agent' not in st.session_state:
     st.session_state.agent = None
@@ -46,7 +65,7 @@ st.sidebar.header("Configuration")
 api_key = st.sidebar.text_input("Google Gemini API Key", type="password", 
                                value=os.getenv("GOOGLE_API_KEY", ""))
 if api_key:
-    st.session_state.agent = LegislativeAgent(api_key)
+    st.session_state.agent = get_agent(api_key)
 else:
     st.sidebar.warning("Please enter your Google Gemini API Key")
     st.info("👈 Enter your Google Gemini API Key in the sidebar to get started")
@@ -56,9 +75,7 @@ st.header("Upload Legislation PDF")
 uploaded_file = st.file_uploader("Choose a PDF file", type="pdf")
 
 if uploaded_file is not None:
-    # Save uploaded file temporarily
-    with open("temp_pdf.pdf", "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    pdf_bytes = uploaded_file.getvalue()
     
     st.success(f"Uploaded: {uploaded_file.name}")
     
@@ -71,8 +88,7 @@ if uploaded_file is not None:
                 with st.spinner("Extracting text from PDF..."):
                     try:
                         logger.info("Extracting text from uploaded PDF")
-                        raw_text = st.session_state.agent.extract_text("temp_pdf.pdf")
-                        cleaned_text = st.session_state.agent.clean_text(raw_text)
+                        cleaned_text = cached_extract(st.session_state.agent, pdf_bytes)
                         st.session_state.cleaned_text = cleaned_text
                         st.session_state.text_extracted = True
                         st.success("Text extracted successfully!")
@@ -90,9 +106,11 @@ if uploaded_file is not None:
                     try:
                         logger.info("Running agent with legal document rule checks")
                         # Run complete processing pipeline
-                        results = st.session_state.agent.process_legislation(
-                            "temp_pdf.pdf", 
-                            "legislation_analysis.json"
+                        api_key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+                        results = cached_process(
+                            st.session_state.agent,
+                            pdf_bytes,
+                            api_key_hash
                         )
                         
                         
@@ -159,7 +177,3 @@ if st.session_state.agent_run:
         mime="application/json",
         use_container_width=True
     )
-
-# Cleanup temporary file
-if os.path.exists("temp_pdf.pdf"):
-    os.remove("temp_pdf.pdf")
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""
+Combined Extractor Module for extracting sections and applying rule checks in a single LLM call.
+"""
+
+import asyncio
+import logging
+import re
+from typing import List, Dict, Any
+from src import llm_cache
+from src import gemini_client
+from src.gemini_client import generate_text, get_model
+
+try:
+    import orjson as _json
+except ImportError:  # orjson is optional, fall back to the standard library
+    import json as _json
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt changes so cached responses are invalidated
+PROMPT_VERSION = "v1"
+
+# Cache namespace keeping combined responses apart from other modules' responses
+CACHE_NAMESPACE = "combined_extractor"
+
+# Markdown code block wrapping a JSON object in an LLM response (greedy, as the object is nested)
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*\})\s*```', re.DOTALL)
+
+# Define the 6 specific legal document rules
+LEGAL_DOCUMENT_RULES = [
+    "Act must define key terms",
+    "Act must specify eligibility criteria", 
+    "Act must specify what the authority (government) must do",
+    "Act must list penalties or enforcement methods",
+    "Act must explain how to calculate payments",
+    "Act must require records or reporting"
+]
+
+SECTION_KEYS = [
+    "definitions",
+    "obligations",
+    "responsibilities",
+    "eligibility",
+    "payments",
+    "penalties",
+    "record_keeping"
+]
+
+class CombinedExtractor:
+    """Section extraction and rule compliance checking in one Google Gemini API call."""
+    
+    def __init__(self, api_key: str):
+        """Initialize the CombinedExtractor with Google Gemini API key."""
+        self.model = get_model(api_key)
+        logger.info("CombinedExtractor initialized with Gemini 2.5 Flash model (temperature=0.3)")
+    
+    async def _acall(self, prompt: str) -> str:
+        """Send a prompt to Gemini, bounded by the shared request limit."""
+        return await generate_text(self.model, prompt)
+    
+    def extract_all(self, text: str) -> Dict[str, Any]:
+        """Extract sections and apply legal document rule checks to the legislation text."""
+        return gemini_client.run(self.extract_all_async(text))
+    
+    async def extract_all_async(self, text: str) -> Dict[str, Any]:
+        """Extract sections and apply rule checks without blocking the event loop."""
+        logger.info("Extracting sections and applying %d rule checks on text of length %d",
+                    len(LEGAL_DOCUMENT_RULES), len(text))
+        rules_text = "\n        ".join(f"{i}. {rule}" for i, rule in enumerate(LEGAL_DOCUMENT_RULES, 1))
+        prompt = f"""
+        Analyze the following legal document/Act text and perform two tasks.
+        
+        Task 1: Extract the following from the Act text:
+        - Definitions
+        - Obligations
+        - Responsibilities
+        - Eligibility
+        - Payments
+        - Penalties
+        - Record-keeping
+        
+        Task 2: Check if the Act follows these {len(LEGAL_DOCUMENT_RULES)} specific rules:
+        {rules_text}
+        
+        For each rule, determine if it 'passes' or 'fails', extract the specific text snippet (evidence) that proves it, and give a confidence score (0-100).
+        
+        Return a single JSON object exactly in this format:
+        {{
+          "sections": {{
+            "definitions": "...",
+            "obligations": "...",
+            "responsibilities": "...",
+            "eligibility": "...",
+            "payments": "...",
+            "penalties": "...",
+            "record_keeping": "..."
+          }},
+          "rule_checks": [
+            {{
+              "rule": "Act must define key terms",
+              "status": "pass",
+              "evidence": "Section 2 - Definitions: 'In this Act, unless the context otherwise requires...'",
+              "confidence": 95
+            }}
+            // ... repeat for all {len(LEGAL_DOCUMENT_RULES)} rules
+          ]
+        }}
+        
+        Legal document/Act text:
+        {text}
+        """
+        cache_key = llm_cache.make_key(CACHE_NAMESPACE, self.model.model_name, PROMPT_VERSION, text)
+        # SQLite blocks, so keep it off the event loop shared by every in-flight request
+        response_text = await asyncio.to_thread(llm_cache.get, cache_key)
+        cached = response_text is not None
+        if not cached:
+            response_text = await self._acall(prompt)
+            # Log the raw response from the LLM
+            logger.debug("Raw LLM response for combined extraction: %s", response_text)
+        else:
+            logger.info("Using cached combined extraction response")
+        
+        # Remove markdown code block wrappers if present
+        json_text = response_text
+        json_match = _JSON_BLOCK_RE.search(json_text)
+        if json_match:
+            json_text = json_match.group(1)
+            logger.info("Extracted JSON from markdown code block for combined extraction")
+        
+        try:
+            result = _json.loads(json_text)
+        except _json.JSONDecodeError as e:
+            logger.warning("Failed to parse combined extraction response as JSON: %s", str(e))
+            logger.warning("Response text: %s", json_text)
+            result = {}
+        if not isinstance(result, dict):
+            logger.warning("Expected object response but got: %s", type(result))
+            result = {}
+        
+        sections = result.get("sections")
+        rule_checks = result.get("rule_checks")
+        # Only cache responses that parse, so a bad response is retried next run
+        if not cached and isinstance(sections, dict) and isinstance(rule_checks, list):
+            await asyncio.to_thread(llm_cache.put, cache_key, response_text)
+        
+        if not isinstance(sections, dict):
+            logger.warning("Combined extraction response is missing sections")
+            sections = self._create_default_sections()
+        
+        if not isinstance(rule_checks, list):
+            logger.warning("Combined extraction response is missing rule checks")
+            rule_checks = self._create_default_rule_checks()
+        
+        logger.info("Combined extraction completed with %d rule checks", len(rule_checks))
+        return {
+            "sections": sections,
+            "rule_checks": rule_checks
+        }
+    
+    def _create_default_sections(self) -> Dict[str, str]:
+        """Create empty sections when LLM response cannot be parsed."""
+        return {key: "" for key in SECTION_KEYS}
+    
+    def _create_default_rule_checks(self) -> List[Dict[str, Any]]:
+        """Create default rule checks when LLM response cannot be parsed."""
+        return [
+            {
+                "rule": rule,
+                "status": "fail",
+                "evidence": "Could not process",
+                "confidence": 0
+            }
+            for rule in LEGAL_DOCUMENT_RULES
+        ]
@@ -0,0 +1,86 @@
+"""
+Gemini Client Module providing the shared Gemini model and bounded-concurrency async requests.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, TypeVar
+import google.generativeai as genai
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "gemini-2.5-flash"
+GENERATION_CONFIG = {"temperature": 0.3}
+
+# Maximum number of in-flight Gemini requests, shared by all LLM modules
+MAX_CONCURRENT_REQUESTS = 8
+
+# google-generativeai caches one grpc_asyncio client per process, and that client
+# is bound to the event loop it was first used on. Every request therefore runs on
+# one long-lived loop in a background thread rather than on a loop per asyncio.run
+_loop = None
+_loop_lock = threading.Lock()
+_semaphore = None
+
+T = TypeVar("T")
+
+# Shared model and the API key it was configured with. The model's async client
+# is only safe to reuse across calls because every request runs on the shared loop
+_model = None
+_model_api_key = None
+_model_lock = threading.Lock()
+
+def get_model(api_key: str) -> genai.GenerativeModel:
+    """Return the Gemini model shared by all LLM modules, configuring the API key once."""
+    global _model, _model_api_key
+    # Agents may be created from several Streamlit sessions at once
+    with _model_lock:
+        # genai.configure is global and models keep their client, so rebuild on key change
+        if _model is None or api_key != _model_api_key:
+            genai.configure(api_key=api_key)
+            _model = genai.GenerativeModel(MODEL_NAME, generation_config=GENERATION_CONFIG)
+            _model_api_key = api_key
+            logger.info("Created shared %s model (temperature=%s)", MODEL_NAME, GENERATION_CONFIG["temperature"])
+        return _model
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its background thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gemini-client-loop", daemon=True).start()
+            logger.info("Started shared Gemini event loop")
+    return _loop
+
+def run(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on the shared event loop and block until it returns."""
+    loop = _get_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("run() cannot be called from the shared event loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+async def _generate_text(model: genai.GenerativeModel, prompt: str) -> str:
+    """Generate a response on the shared loop, waiting while too many requests are in flight."""
+    global _semaphore
+    # Only ever touched from the shared loop's thread, so lazy creation is race-free
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    async with _semaphore:
+        response = await model.generate_content_async(prompt)
+    return response.text if response.text else ""
+
+async def generate_text(model: genai.GenerativeModel, prompt: str) -> str:
+    """Generate a response for the prompt, waiting while too many requests are in flight."""
+    loop = _get_loop()
+    if asyncio.get_running_loop() is not loop:
+        # Hop onto the shared loop so the cached async client is only used from it
+        future = asyncio.run_coroutine_threadsafe(_generate_text(model, prompt), loop)
+        return await asyncio.wrap_future(future)
+    return await _generate_text(model, prompt)
\ No newline at end of file
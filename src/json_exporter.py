@@ -6,10 +6,22 @@ import json
 import logging
 from typing import Dict, List, Any
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the standard library
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _write_json(output: Dict[str, Any], path: str) -> None:
+    """Write a dictionary to a pretty-printed JSON file, using orjson when available."""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(output, f, indent=2)
+
 class JSONExporter:
     """Export results to JSON files."""
     
@@ -23,8 +35,7 @@ class JSONExporter:
             "sections": sections,
             "rule_checks": rule_checks
         }
-        with open(path, 'w') as f:
-            json.dump(output, f, indent=2)
+        _write_json(output, path)
         logger.info("JSON export completed")
     
     @staticmethod
@@ -34,6 +45,5 @@ class JSONExporter:
         output = {
             "chunk_summaries": summaries
         }
-        with open(path, 'w') as f:
-            json.dump(output, f, indent=2)
+        _write_json(output, path)
         logger.info("Chunk summaries export completed")
\ No newline at end of file
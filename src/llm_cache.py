@@ -0,0 +1,86 @@
+"""
+LLM Cache Module for memoizing Gemini responses on disk keyed by content hash.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.path.join(".cache", "llm_cache.sqlite")
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7 days, in seconds
+
+# The table is created on the first connection only, not on every lookup
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def make_key(namespace: str, model_name: str, prompt_version: str, text: str) -> str:
+    """Build a cache key from the calling module's namespace, the model, the prompt version and the input text."""
+    digest = hashlib.sha256()
+    # Length-prefix every field so different splits of the same characters never collide
+    for field in (namespace, model_name, prompt_version, text):
+        encoded = field.encode("utf-8")
+        digest.update(b"%d:" % len(encoded))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating it on first use in this process."""
+    global _schema_ready
+    with _schema_lock:
+        if not _schema_ready:
+            os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+            with closing(sqlite3.connect(CACHE_PATH)) as conn, conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+                )
+            _schema_ready = True
+    return sqlite3.connect(CACHE_PATH)
+
+def get(key: str) -> Optional[str]:
+    """Return the cached response for a key, or None on a miss or expired entry.
+    
+    Blocks on SQLite, so coroutines should call it via asyncio.to_thread.
+    """
+    try:
+        with closing(_connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            expired = row is not None and row[1] < time.time()
+            if expired:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+    except sqlite3.Error as e:
+        logger.warning("Failed to read from LLM cache: %s", str(e))
+        return None
+    if row is None:
+        return None
+    if expired:
+        logger.debug("LLM cache entry expired: %s", key)
+        return None
+    logger.info("LLM cache hit: %s", key)
+    return row[0]
+
+def put(key: str, value: str, ttl: int = DEFAULT_TTL) -> None:
+    """Store a response in the cache for ttl seconds, dropping any expired entries.
+    
+    Blocks on SQLite, so coroutines should call it via asyncio.to_thread.
+    """
+    now = time.time()
+    try:
+        with closing(_connect()) as conn, conn:
+            # Purge expired entries here so the database does not grow without bound
+            conn.execute("DELETE FROM llm_cache WHERE expires_at < ?", (now,))
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl)
+            )
+    except sqlite3.Error as e:
+        logger.warning("Failed to write to LLM cache: %s", str(e))
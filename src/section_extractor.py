@@ -2,78 +2,27 @@
 Section Extractor Module for extracting specific sections from legislation text.
 """
 
-import google.generativeai as genai
-import json
 import logging
-import re
+from typing import Dict
+from src import gemini_client
+from src.combined_extractor import CombinedExtractor
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class SectionExtractor:
-    """Section extraction from legislation text using Google Gemini API."""
+    """Section extraction from legislation text, backed by the combined Gemini extraction call."""
     
     def __init__(self, api_key: str):
         """Initialize the SectionExtractor with Google Gemini API key."""
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash",
-                                         generation_config={"temperature": 0.3})
-        logger.info("SectionExtractor initialized with Gemini 2.5 Flash model (temperature=0.3)")
+        self.extractor = CombinedExtractor(api_key)
+        logger.info("SectionExtractor initialized")
     
-    def extract_sections(self, text: str) -> dict:
+    def extract_sections(self, text: str) -> Dict[str, str]:
         """Extract specific sections from the legislation text."""
+        return gemini_client.run(self.extract_sections_async(text))
+    
+    async def extract_sections_async(self, text: str) -> Dict[str, str]:
+        """Extract specific sections from the legislation text without blocking the event loop."""
         logger.info("Extracting sections from text of length %d", len(text))
-        prompt = f"""
-        Extract the following from the Act text:
-        
-        - Definitions
-        - Obligations
-        - Responsibilities
-        - Eligibility
-        - Payments
-        - Penalties
-        - Record-keeping
-        
-        Return JSON exactly in this format:
-        {{
-          "definitions": "...",
-          "obligations": "...",
-          "responsibilities": "...",
-          "eligibility": "...",
-          "payments": "...",
-          "penalties": "...",
-          "record_keepin": "..."
-        }}
-        
-        Act text:
-        {text}
-        """
-        response = self.model.generate_content(prompt)
-        
-        logger.info("Raw LLM response: %s", response.text)
-        
-
-        response_text = response.text
-        
-        json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(1)
-            logger.info("Extracted JSON from markdown code block")
-        
-        try:
-            result = json.loads(response_text)
-            logger.info("Sections extracted successfully")
-            return result
-        except json.JSONDecodeError as e:
-            
-            logger.warning("Failed to parse section extraction response as JSON: %s", str(e))
-            logger.warning("Response text: %s", response_text)
-            return {
-                "definitions": "",
-                "obligations": "",
-                "responsibilities": "",
-                "eligibility": "",
-                "payments": "",
-                "penalties": "",
-                "record_keeping": ""
-            }
\ No newline at end of file
+        result = await self.extractor.extract_all_async(text)
+        return result["sections"]
\ No newline at end of file
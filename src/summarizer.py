@@ -2,52 +2,85 @@
 Summarizer Module for text summarization using Google Gemini API.
 """
 
-import google.generativeai as genai
+import asyncio
 import logging
-from typing import List
+from typing import Iterable, List
+from src import llm_cache
+from src import gemini_client
+from src.gemini_client import generate_text, get_model
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump when the prompts change so cached responses are invalidated
+PROMPT_VERSION = "v1"
+
+# Cache namespace keeping chunk summaries apart from other modules' responses
+CACHE_NAMESPACE = "summarizer.chunk"
+
 class Summarizer:
     """Text summarization using Google Gemini API."""
     
     def __init__(self, api_key: str):
         """Initialize the Summarizer with Google Gemini API key."""
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash", 
-                                         generation_config={"temperature": 0.3})
+        self.model = get_model(api_key)
         logger.info("Summarizer initialized with Gemini 2.5 Flash model (temperature=0.3)")
     
+    async def _acall(self, prompt: str) -> str:
+        """Send a prompt to Gemini, bounded by the shared request limit."""
+        return await generate_text(self.model, prompt)
+    
     def summarize_chunk(self, chunk: str) -> str:
         """Summarize a single text chunk using Gemini."""
+        return gemini_client.run(self.summarize_chunk_async(chunk))
+    
+    async def summarize_chunk_async(self, chunk: str) -> str:
+        """Summarize a single text chunk using Gemini without blocking the event loop."""
         logger.info("Summarizing chunk of length %d", len(chunk))
+        cache_key = llm_cache.make_key(CACHE_NAMESPACE, self.model.model_name, PROMPT_VERSION, chunk)
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            logger.info("Using cached summary for chunk")
+            return cached
         prompt = f"""
         Summarize the following text in 3–4 bullet points:
         
         {chunk}
         """
-        response = self.model.generate_content(prompt)
+        result = await self._acall(prompt)
         # Log the raw response from the LLM
-        logger.info("Raw LLM response for chunk: %s", response.text)
-        result = response.text if response.text else ""
+        logger.debug("Raw LLM response for chunk: %s", result)
         logger.info("Chunk summary generated with length %d", len(result))
+        if result:
+            await asyncio.to_thread(llm_cache.put, cache_key, result)
         return result
     
-    def summarize_chunks(self, chunks: List[str]) -> List[str]:
-        """Generate summaries for all text chunks."""
-        logger.info("Summarizing %d chunks", len(chunks))
+    async def summarize_chunks_async(self, chunks: Iterable[str]) -> List[str]:
+        """Generate summaries for all text chunks concurrently."""
+        tasks = [self.summarize_chunk_async(chunk) for chunk in chunks]
+        logger.info("Summarizing %d chunks", len(tasks))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Failed chunks fall back to an empty summary so order is preserved
         summaries = []
-        for i, chunk in enumerate(chunks):
-            logger.info("Processing chunk %d/%d", i+1, len(chunks))
-            summary = self.summarize_chunk(chunk)
-            summaries.append(summary)
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                logger.warning("Failed to summarize chunk %d: %s", i+1, str(result))
+                summaries.append("")
+            else:
+                summaries.append(result)
         logger.info("All chunks summarized")
         return summaries
     
+    def summarize_chunks(self, chunks: Iterable[str]) -> List[str]:
+        """Generate summaries for all text chunks."""
+        return gemini_client.run(self.summarize_chunks_async(chunks))
+    
     def combine_summaries(self, chunk_summaries: List[str]) -> str:
         """Combine chunk summaries into a final comprehensive summary."""
+        return gemini_client.run(self.combine_summaries_async(chunk_summaries))
+    
+    async def combine_summaries_async(self, chunk_summaries: List[str]) -> str:
+        """Combine chunk summaries into a final summary without blocking the event loop."""
         logger.info("Combining %d chunk summaries", len(chunk_summaries))
         combined_text = "\n\n".join(chunk_summaries)
         prompt = f"""
@@ -61,9 +94,42 @@ class Summarizer:
         Sub-summaries:
         {combined_text}
         """
-        response = self.model.generate_content(prompt)
+        result = await self._acall(prompt)
         # Log the raw response from the LLM
-        logger.info("Raw LLM response for combined summary: %s", response.text)
-        result = response.text if response.text else ""
+        logger.debug("Raw LLM response for combined summary: %s", result)
         logger.info("Final summary generated with length %d", len(result))
-        return result
\ No newline at end of file
+        return result
+    
+    async def _merge_group(self, summaries: List[str]) -> str:
+        """Merge a group of summaries into one intermediate summary."""
+        logger.info("Merging group of %d summaries", len(summaries))
+        combined_text = "\n\n".join(summaries)
+        prompt = f"""
+        Merge these sub-summaries of consecutive parts of an Act into one summary (4–6 bullet points),
+        keeping any purpose, definitions, eligibility, obligations and enforcement details:
+        
+        {combined_text}
+        """
+        result = await self._acall(prompt)
+        # Log the raw response from the LLM
+        logger.debug("Raw LLM response for merged summary: %s", result)
+        logger.info("Merged summary generated with length %d", len(result))
+        return result
+    
+    def tree_combine(self, chunk_summaries: List[str], fanout: int = 4) -> str:
+        """Combine chunk summaries into a final summary by hierarchical merging."""
+        return gemini_client.run(self.tree_combine_async(chunk_summaries, fanout))
+    
+    async def tree_combine_async(self, chunk_summaries: List[str], fanout: int = 4) -> str:
+        """Merge summaries in groups of fanout per layer until one final combine remains."""
+        if fanout < 2:
+            raise ValueError("fanout must be at least 2")
+        # Failed chunks yield empty summaries, which carry nothing worth merging
+        summaries = [summary for summary in chunk_summaries if summary]
+        layer = 0
+        while len(summaries) > fanout:
+            layer += 1
+            groups = [summaries[i:i+fanout] for i in range(0, len(summaries), fanout)]
+            logger.info("Tree merge layer %d: merging %d summaries into %d", layer, len(summaries), len(groups))
+            summaries = await asyncio.gather(*[self._merge_group(group) for group in groups])
+        return await self.combine_summaries_async(summaries)
\ No newline at end of file
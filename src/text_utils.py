@@ -2,52 +2,205 @@
 Text Utilities Module for PDF text extraction, cleaning, and chunking.
 """
 
+import codecs
+import hashlib
+import multiprocessing
+import os
 import re
+import time
 import fitz  # PyMuPDF
 import logging
+from multiprocessing.pool import AsyncResult
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pages taking longer than this (in seconds) to extract are skipped, and the worker
+# process extracting them is terminated
+PAGE_TIMEOUT = 30
+
+_TEXT_FLAGS = fitz.TEXT_MEDIABOX_CLIP
+
+# Extracted text is cached here, keyed by the SHA-256 of the PDF contents and EXTRACTION_VERSION
+PDF_TEXT_CACHE_DIR = os.path.join(".cache", "pdf_text")
+
+# Bump when the extracted text changes (e.g. new text flags) so cached text is invalidated
+EXTRACTION_VERSION = "v2"
+
+# Page indicators ("Page X of Y")
+_PAGE_RE = re.compile(r"Page\s*\d+\s*of\s*\d+")
+# Isolated numbers (often page numbers); must run after _PAGE_RE, as removing a
+# page indicator can leave a number alone on its line
+_ISOLATED_NUM_RE = re.compile(r"^\s*\d+\s*$", re.MULTILINE)
+_WS_RE = re.compile(r"\s+")
+
+# Codec error handler name used to replace non-ASCII characters with a space
+_NON_ASCII_TO_SPACE = "text_utils.space"
+
+def _replace_with_space(error: UnicodeEncodeError) -> Tuple[str, int]:
+    """Replace the unencodable characters in a codec error with a single space."""
+    return " ", error.end
+
+codecs.register_error(_NON_ASCII_TO_SPACE, _replace_with_space)
+
+def _page_text(page: fitz.Page) -> str:
+    """Extract plain text from a page with the cheapest flags that suit LLM input."""
+    # Skip dehyphenation, whitespace preservation and ligature preservation (ligatures
+    # are expanded to plain ASCII, which clean_text would otherwise strip), and keep
+    # content-stream order instead of sorting blocks by position
+    return page.get_text("text", flags=_TEXT_FLAGS, sort=False)
+
+def _file_sha256(path: str) -> str:
+    """Compute the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _open_pdf(source: Union[str, bytes]) -> fitz.Document:
+    """Open a PDF from a file path or from its raw bytes."""
+    if isinstance(source, bytes):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
 def extract_text_from_pdf(pdf_path: str) -> str:
-    """Extract text from a PDF file using PyMuPDF."""
-    logger.info("Extracting text from PDF: %s", pdf_path)
-    doc = fitz.open(pdf_path)
-    text = ""
-    for page_num, page in enumerate(doc):
-        page_text = page.get_text()
-        text += page_text
-        logger.debug("Extracted text from page %d, length: %d", page_num, len(page_text))
-    doc.close()
-    logger.info("PDF text extraction completed, total length: %d", len(text))
+    """Extract text from a PDF file, reusing cached text for previously seen file contents."""
+    return _extract_text_cached(pdf_path, _file_sha256(pdf_path))
+
+def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
+    """Extract text from PDF contents held in memory, reusing cached text for previously seen contents."""
+    return _extract_text_cached(pdf_bytes, hashlib.sha256(pdf_bytes).hexdigest())
+
+def _extract_text_cached(source: Union[str, bytes], digest: str) -> str:
+    """Extract text from a PDF path or bytes, cached by the SHA-256 digest of its contents."""
+    cache_path = os.path.join(PDF_TEXT_CACHE_DIR, f"{digest}-{EXTRACTION_VERSION}.txt")
+    if os.path.exists(cache_path):
+        logger.info("Loading cached PDF text from: %s", cache_path)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    text, complete = _extract_text_uncached(source)
+    if not complete:
+        # Don't cache text with skipped pages so a later run can retry them
+        return text
+    try:
+        os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+    except OSError as e:
+        logger.warning("Failed to cache PDF text: %s", str(e))
     return text
 
+# Per-process state of extraction workers. PyMuPDF does not support Python threads,
+# so pages are extracted in worker processes that each open their own document
+_worker_doc = None
+_worker_started = None
+
+def _init_worker(source: Union[str, bytes], started) -> None:
+    """Open the PDF once per worker process and keep the shared page start times."""
+    global _worker_doc, _worker_started
+    _worker_doc = _open_pdf(source)
+    _worker_started = started
+
+def _extract_page(page_num: int) -> str:
+    """Extract one page's text in a worker process, recording when it started."""
+    _worker_started[page_num] = time.time()
+    page_text = _page_text(_worker_doc[page_num])
+    logger.debug("Extracted text from page %d, length: %d", page_num, len(page_text))
+    return page_text
+
+def _wait_for_pages(results: Dict[int, AsyncResult], started, texts: List[Optional[str]]) -> List[int]:
+    """Collect page texts into texts until every page is done or one exceeds PAGE_TIMEOUT.
+    
+    Returns the pages that hung, or an empty list once every page's text is collected.
+    """
+    remaining = list(results)
+    while True:
+        for page_num in [page_num for page_num in remaining if results[page_num].ready()]:
+            texts[page_num] = results[page_num].get()
+            remaining.remove(page_num)
+        if not remaining:
+            return []
+        # Only pages that have started can hang; queued pages wait for a free worker
+        deadlines = {page_num: started[page_num] + PAGE_TIMEOUT for page_num in remaining if started[page_num]}
+        now = time.time()
+        hung = [page_num for page_num, deadline in deadlines.items() if now >= deadline]
+        if hung:
+            for page_num in hung:
+                logger.warning("Skipping page %d: text extraction took over %ds", page_num, PAGE_TIMEOUT)
+            return hung
+        timeout = min([1.0] + [deadline - now for deadline in deadlines.values()])
+        results[remaining[0]].wait(max(timeout, 0))
+
+def _extract_pages(source: Union[str, bytes], page_nums: List[int], texts: List[Optional[str]]) -> List[int]:
+    """Extract the given pages into texts on a fresh worker pool, returning the pages that hung."""
+    # Start time of each page, written by the workers (0 until the page starts)
+    started = multiprocessing.RawArray("d", len(texts))
+    processes = max(1, min(os.cpu_count() or 1, len(page_nums)))
+    pool = multiprocessing.Pool(processes, initializer=_init_worker, initargs=(source, started))
+    try:
+        results = {page_num: pool.apply_async(_extract_page, (page_num,)) for page_num in page_nums}
+        return _wait_for_pages(results, started, texts)
+    finally:
+        # Terminating also kills workers stuck on hung pages, closing their documents
+        pool.terminate()
+        pool.join()
+
+def _extract_text_uncached(source: Union[str, bytes]) -> Tuple[str, bool]:
+    """Extract text from a PDF path or bytes using PyMuPDF, processing pages in parallel worker processes.
+    
+    Returns the text and whether every page was extracted within PAGE_TIMEOUT.
+    """
+    logger.info("Extracting text from PDF: %s", source if isinstance(source, str) else "<%d bytes>" % len(source))
+    with _open_pdf(source) as doc:
+        page_count = doc.page_count
+    
+    texts: List[Optional[str]] = [None] * page_count
+    skipped = []
+    pending = list(range(page_count))
+    while pending:
+        # Hung pages are skipped and their pool terminated, so the pages still
+        # outstanding are retried on a fresh pool instead of queueing behind them
+        skipped += _extract_pages(source, pending, texts)
+        pending = [page_num for page_num in pending if texts[page_num] is None and page_num not in skipped]
+    text = "".join(page_text for page_text in texts if page_text is not None)
+    logger.info("PDF text extraction completed, %d pages, total length: %d", page_count, len(text))
+    return text, not skipped
+
 def clean_text(text: str) -> str:
     """Clean extracted text by removing artifacts and normalizing whitespace."""
     logger.info("Cleaning text of length %d", len(text))
     # Remove page numbers and page indicators
-    text = re.sub(r"Page\s*\d+\s*of\s*\d+", "", text)
-    
-    # Multiple blank lines → one
-    text = re.sub(r"\n{2,}", "\n", text)
+    text = _PAGE_RE.sub("", text)
     
-    # Remove isolated numbers (often page numbers)
-    text = re.sub(r"^\s*\d+\s*$", "", text, flags=re.MULTILINE)
+    # Remove isolated numbers (often page numbers); blank lines are collapsed by
+    # the whitespace pass below
+    text = _ISOLATED_NUM_RE.sub("", text)
     
-    # Remove non-ASCII characters
-    text = re.sub(r"[^\x00-\x7F]+", " ", text)
+    # Replace non-ASCII characters with spaces, using the C-level ASCII encoder
+    if not text.isascii():
+        text = text.encode("ascii", _NON_ASCII_TO_SPACE).decode("ascii")
     
     # Remove excessive whitespace
-    text = re.sub(r"\s+", " ", text)
+    text = _WS_RE.sub(" ", text)
     
     result = text.strip()
     logger.info("Text cleaning completed, final length: %d", len(result))
     return result
 
-def chunk_text(text: str, chunk_size: int = 6000) -> list:
-    """Split text into chunks of specified size."""
-    logger.info("Chunking text of length %d with chunk size %d", len(text), chunk_size)
-    chunks = [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
-    logger.info("Text chunking completed, created %d chunks", len(chunks))
-    return chunks
\ No newline at end of file
+def chunk_text(text: str, chunk_size: int = 6000, chunk_overlap: int = 200) -> Iterator[str]:
+    """Lazily split text into chunks of specified size, overlapping by chunk_overlap characters."""
+    # Validate here rather than in the generator so bad arguments fail at the call site
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError("chunk_overlap must be non-negative and smaller than chunk_size")
+    logger.info("Chunking text of length %d with chunk size %d and overlap %d",
+                len(text), chunk_size, chunk_overlap)
+    return _iter_chunks(text, chunk_size, chunk_size - chunk_overlap)
+
+def _iter_chunks(text: str, chunk_size: int, step: int) -> Iterator[str]:
+    """Yield chunk_size slices of text starting every step characters."""
+    for i in range(0, len(text), step):
+        yield text[i:i+chunk_size]
+        # Stop once the end of the text is reached to avoid a trailing overlap-only chunk
+        if i + chunk_size >= len(text):
+            break